@@ -8,6 +8,7 @@ from typing import List
 from app.db.database import get_db
 from app.models.test_item import TestItem
 from app.schemas.test_item import TestItemCreate, TestItemResponse
+from app.services.audit import audit_writer, AuditEventType
 
 router = APIRouter(prefix="/test", tags=["test"])
 
@@ -24,6 +25,7 @@ def create_test_item(
     - Database write operations
     - Request validation via Pydantic
     - Response serialization
+    - Audit event enqueued outside the request transaction
     """
     db_item = TestItem(
         title=item.title,
@@ -33,6 +35,11 @@ def create_test_item(
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    audit_writer.emit(
+        AuditEventType.ITEM_CREATED,
+        resource=f"test_item:{db_item.id}",
+        payload={"title": db_item.title}
+    )
     return db_item
 
 
@@ -96,6 +103,7 @@ def delete_test_item(
         )
     db.delete(item)
     db.commit()
+    audit_writer.emit(AuditEventType.ITEM_DELETED, resource=f"test_item:{item_id}")
     return None
 
 
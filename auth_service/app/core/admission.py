@@ -0,0 +1,125 @@
+"""
+Adaptive admission control (load shedding) middleware.
+
+Caps the number of in-flight requests per route class with an AIMD
+(additive increase, multiplicative decrease) concurrency limit. The limit
+grows by one while requests complete within the latency target and the
+database pool is not queueing, and shrinks multiplicatively as soon as
+either signal shows saturation. Requests over the limit are rejected
+immediately with 503 and Retry-After instead of queueing behind get_db()
+and the threadpool.
+"""
+import time
+from typing import Callable, Dict, Iterable
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db.database import pool_wait_stats
+
+
+class AIMDLimiter:
+    """
+    AIMD concurrency limit for a single route class.
+
+    Not thread-safe: acquire/release are called from the event loop only.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        latency_target: float = 0.5,
+        pool_wait_target: float = 0.05,
+        backoff_ratio: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.pool_wait_target = pool_wait_target
+        self.backoff_ratio = backoff_ratio
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        """Admit a request if below the current limit."""
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, pool_wait: float, failed: bool = False):
+        """Record a completed request and adjust the limit."""
+        in_flight = self.in_flight
+        self.in_flight -= 1
+
+        if failed or latency > self.latency_target or pool_wait > self.pool_wait_target:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        elif in_flight * 2 >= self.limit:
+            # Only grow when the current limit is actually being used
+            self.limit = min(self.max_limit, self.limit + 1)
+
+
+def method_route_class(scope: Scope) -> str:
+    """Default route classifier: reads and writes get separate limits."""
+    return "read" if scope["method"] in ("GET", "HEAD", "OPTIONS") else "write"
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware enforcing a per-route-class adaptive concurrency limit.
+
+    Paths in ``exempt_paths`` (health and liveness checks) are never shed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        exempt_paths: Iterable[str] = ("/health",),
+        route_classifier: Callable[[Scope], str] = method_route_class,
+        retry_after: int = 1,
+        **limiter_options,
+    ):
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+        self.route_classifier = route_classifier
+        self.retry_after = retry_after
+        self.limiter_options = limiter_options
+        self.limiters: Dict[str, AIMDLimiter] = {}
+
+    def get_limiter(self, route_class: str) -> AIMDLimiter:
+        limiter = self.limiters.get(route_class)
+        if limiter is None:
+            limiter = self.limiters[route_class] = AIMDLimiter(**self.limiter_options)
+        return limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.get_limiter(self.route_classifier(scope))
+        if not limiter.try_acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Service is overloaded, please retry later"},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        failed = False
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            limiter.release(
+                time.perf_counter() - started,
+                pool_wait_stats.average,
+                failed=failed,
+            )
+
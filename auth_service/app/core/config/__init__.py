@@ -4,7 +4,7 @@ Automatically loads the correct configuration based on ENVIRONMENT variable.
 """
 import os
 from typing import Union
-from .base import BaseConfig, Environment
+from .base import BaseConfig, Environment, AuditOverflowPolicy
 from .development import DevelopmentConfig
 from .production import ProductionConfig
 
@@ -57,4 +57,5 @@ __all__ = [
     "DevelopmentConfig",
     "ProductionConfig",
     "Environment",
+    "AuditOverflowPolicy",
 ]
@@ -13,6 +13,13 @@ class Environment(str, Enum):
     TESTING = "testing"
 
 
+class AuditOverflowPolicy(str, Enum):
+    """What the audit writer does when its in-process queue is full"""
+    DROP = "drop"    # Discard the new event
+    BLOCK = "block"  # Wait up to AUDIT_BLOCK_TIMEOUT_SECONDS, then drop
+    SPILL = "spill"  # Append the event to AUDIT_SPILL_PATH for a later flush
+
+
 class BaseConfig(BaseSettings):
     """
     Base configuration class with settings common to all environments.
@@ -49,6 +56,36 @@ class BaseConfig(BaseSettings):
     # Database
     DATABASE_URL: str
 
+    # Audit Events - Batched asynchronous writer
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_OVERFLOW_POLICY: AuditOverflowPolicy = AuditOverflowPolicy.DROP
+    AUDIT_BLOCK_TIMEOUT_SECONDS: float = 0.5
+    AUDIT_SPILL_PATH: str = "/tmp/sage_audit_spill.jsonl"  # /tmp is writable in Lambda
+
+    # Admission Control - Adaptive load shedding (see app/core/admission.py)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/", "/health"]  # Liveness/health checks are never shed
+    ADMISSION_INITIAL_LIMIT: Optional[int] = None  # Starting in-flight limit per route class; defaults to DB pool capacity
+    ADMISSION_MIN_LIMIT: int = 2
+    ADMISSION_MAX_LIMIT: int = 200
+    ADMISSION_LATENCY_TARGET_MS: int = 500  # Shrink the limit when requests take longer
+    ADMISSION_POOL_WAIT_TARGET_MS: int = 50  # Shrink the limit when DB pool checkout waits longer
+    ADMISSION_BACKOFF_RATIO: float = 0.9
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Production Server - gunicorn with uvicorn workers (see app/core/server.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None  # Defaults to available CPUs (cgroup-aware)
+    SERVER_MAX_REQUESTS: int = 10000  # Recycle a worker after this many requests (0 disables)
+    SERVER_MAX_REQUESTS_JITTER: int = 1000  # Spread recycling so workers don't restart together
+    SERVER_MAX_WORKER_MEMORY_MB: int = 512  # Recycle a worker above this RSS (0 disables)
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # Seconds before SIGKILL on SIGTERM; requests drain for 5s less
+    SERVER_TIMEOUT: int = 60
+    SERVER_KEEPALIVE: int = 5
+
     # Frontend URL
     FRONTEND_URL: str = "http://localhost:3000"
 
@@ -0,0 +1,198 @@
+"""
+Production server launcher.
+
+Runs the FastAPI app under gunicorn with uvicorn workers:
+- one worker per available CPU by default (respects cgroup CPU quotas)
+- the app is preloaded and the schema created once in the master before
+  fork, and each worker gets a fresh database connection pool after fork
+- uvloop/httptools are used when installed
+- workers are recycled after SERVER_MAX_REQUESTS requests or when their
+  resident memory exceeds SERVER_MAX_WORKER_MEMORY_MB
+- SIGTERM drains in-flight requests for up to SERVER_GRACEFUL_TIMEOUT minus
+  LIFESPAN_SHUTDOWN_MARGIN seconds, leaving time for the lifespan shutdown
+"""
+import importlib.util
+import math
+import os
+import resource
+import signal
+from typing import Optional
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+
+# Seconds of SERVER_GRACEFUL_TIMEOUT reserved for the lifespan shutdown
+# (the audit writer's final flush) after in-flight requests have drained
+LIFESPAN_SHUTDOWN_MARGIN = 5
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def cgroup_cpu_limit() -> Optional[int]:
+    """
+    Returns the CPU limit imposed by the container's cgroup, if any.
+
+    Checks cgroup v2 (cpu.max) first, then cgroup v1 (cfs quota/period).
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    quota = _read_int("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read_int("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and quota > 0:
+        return max(1, math.ceil(quota / period))
+
+    return None
+
+
+def available_cpus() -> int:
+    """
+    Returns the number of CPUs this process can actually use:
+    the scheduler affinity mask, capped by the cgroup quota.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        cpus = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, limit)
+    return max(1, cpus)
+
+
+def current_rss_mb() -> float:
+    """Returns the resident set size of the current process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Fallback: peak RSS (kilobytes on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def drain_timeout(graceful_timeout: int) -> int:
+    """Returns the request drain budget within gunicorn's graceful timeout."""
+    return max(1, graceful_timeout - LIFESPAN_SHUTDOWN_MARGIN)
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+class SageUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker with explicit event loop/HTTP parser selection,
+    graceful shutdown timeout and memory-based recycling.
+    """
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Bound the time spent draining in-flight requests on SIGTERM.
+        # The gunicorn master SIGKILLs workers once graceful_timeout elapses,
+        # and uvicorn only runs the lifespan shutdown (which flushes queued
+        # audit events) after draining, so the drain must finish earlier.
+        self.config.timeout_graceful_shutdown = drain_timeout(self.cfg.graceful_timeout)
+
+    async def callback_notify(self) -> None:
+        """
+        Heartbeat called periodically from the uvicorn server loop.
+        Also recycles the worker once it grows past the memory limit.
+        """
+        await super().callback_notify()
+
+        limit_mb = settings.SERVER_MAX_WORKER_MEMORY_MB
+        if limit_mb and current_rss_mb() > limit_mb:
+            self.log.warning(
+                "Worker %s exceeded %s MB RSS, recycling", self.pid, limit_mb
+            )
+            # uvicorn handles SIGTERM by draining and exiting;
+            # the gunicorn master then spawns a replacement
+            os.kill(self.pid, signal.SIGTERM)
+
+
+def on_starting(server):
+    """
+    Gunicorn hook run once in the master, after the app is preloaded.
+
+    Creates the schema before any worker starts. Workers running
+    CREATE TABLE concurrently on a fresh Postgres database can fail on
+    duplicate pg_type entries, and a worker boot error halts the master.
+    """
+    from app.db.database import engine, init_db
+
+    init_db()
+    # Don't leave a pooled connection for the workers to inherit
+    engine.dispose()
+
+
+def post_fork(server, worker):
+    """
+    Gunicorn hook run in each worker right after fork.
+
+    The engine was created in the master while preloading the app. Drop its
+    pool without closing the parent's connections, so every worker opens its
+    own sockets instead of sharing inherited ones.
+    """
+    from app.db.database import engine
+
+    engine.dispose(close=False)
+
+
+class SageApplication(BaseApplication):
+    """Gunicorn application configured from app settings."""
+
+    def __init__(self, app_uri: str, options: Optional[dict] = None):
+        self.app_uri = app_uri
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return import_app(self.app_uri)
+
+
+def get_server_options() -> dict:
+    """Returns gunicorn options derived from settings."""
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": settings.SERVER_WORKERS or available_cpus(),
+        "worker_class": f"{__name__}.SageUvicornWorker",
+        "preload_app": True,
+        "on_starting": on_starting,
+        "post_fork": post_fork,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "timeout": settings.SERVER_TIMEOUT,
+        "keepalive": settings.SERVER_KEEPALIVE,
+    }
+
+
+def run(app_uri: str = "main:app"):
+    """Start the production server. Blocks until shutdown."""
+    SageApplication(app_uri, get_server_options()).run()
@@ -1,4 +1,4 @@
 """Database module exports"""
-from .database import get_db, init_db, Base, engine, SessionLocal
+from .database import get_db, init_db, Base, engine, SessionLocal, pool_wait_stats
 
-__all__ = ["get_db", "init_db", "Base", "engine", "SessionLocal"]
+__all__ = ["get_db", "init_db", "Base", "engine", "SessionLocal", "pool_wait_stats"]
@@ -1,15 +1,67 @@
 """
 Database connection and session management.
 """
+import json
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
+
+class PoolWaitStats:
+    """
+    Exponentially weighted moving average of connection pool wait time.
+    Read by the admission control middleware as a saturation signal.
+    """
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.average = 0.0
+
+    def record(self, seconds: float):
+        self.average += self.alpha * (seconds - self.average)
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long checkouts queue for a free connection.
+
+    Only the wait for a connection to be returned to an exhausted pool is
+    measured. Pre-ping round-trips and opening new connections happen
+    outside of it, so a slow or distant database does not read as pool
+    saturation.
+    """
+
+    def capacity(self) -> int:
+        """Connections that can be checked out at once (pool size + overflow)."""
+        return self.size() + max(self._max_overflow, 0)
+
+    def _do_get(self):
+        exhausted = -1 < self._max_overflow <= self.overflow()
+        if not exhausted:
+            # Either an idle connection or room to open a new one: no queueing
+            pool_wait_stats.record(0.0)
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_stats.record(time.perf_counter() - started)
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=TimedQueuePool,  # Feeds pool_wait_stats for admission control
     pool_pre_ping=True,  # Verify connections before using them
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    # JSON columns accept UUID/Decimal/datetime values (e.g. audit payloads)
+    json_serializer=lambda obj: json.dumps(obj, default=str),
 )
 
 # Create session factory
@@ -31,13 +83,24 @@ def get_db():
         db.close()
 
 
+# Set once the schema has been created in this process. Forked server
+# workers inherit it from the master, so only the master creates tables.
+_schema_initialized = False
+
+
 def init_db():
     """
     Initialize database by creating all tables.
-    Called during application startup.
+    Called during application startup; no-op if already done in this
+    process or in the process it was forked from.
     """
+    global _schema_initialized
+    if _schema_initialized:
+        return
+
     # Import all models here so they're registered with Base
-    from app.models import test_item  # noqa
+    from app.models import test_item, audit_event  # noqa
 
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    _schema_initialized = True
@@ -6,24 +6,29 @@ from contextlib import asynccontextmanager
 from mangum import Mangum
 
 from app.core.config import settings
-from app.db.database import get_db, init_db
+from app.core.admission import AdmissionControlMiddleware
+from app.db.database import get_db, init_db, engine
 from app.api.v1 import test_router
+from app.services.audit import audit_writer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan event handler for startup and shutdown.
-    Initializes database on startup.
+    Initializes database and starts the audit writer on startup,
+    and flushes pending audit events on shutdown.
     """
     # Startup: Initialize database
     print("Starting up Sage Auth Service...")
     print("Initializing database...")
     init_db()
     print("Database initialized successfully")
+    await audit_writer.start()
     yield
     # Shutdown
     print("Shutting down Sage Auth Service...")
+    await audit_writer.stop()
 
 
 app = FastAPI(
@@ -33,6 +38,22 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Admission control - shed load with a fast 503 when the database saturates.
+# Added before CORS so rejected responses still carry CORS headers.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        exempt_paths=settings.ADMISSION_EXEMPT_PATHS,
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+        # Starting above the pool capacity would queue on the pool at once
+        initial_limit=settings.ADMISSION_INITIAL_LIMIT or engine.pool.capacity(),
+        min_limit=settings.ADMISSION_MIN_LIMIT,
+        max_limit=settings.ADMISSION_MAX_LIMIT,
+        latency_target=settings.ADMISSION_LATENCY_TARGET_MS / 1000,
+        pool_wait_target=settings.ADMISSION_POOL_WAIT_TARGET_MS / 1000,
+        backoff_ratio=settings.ADMISSION_BACKOFF_RATIO,
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -80,5 +101,7 @@ async def health_check(db: Session = Depends(get_db)):
 
 # Lambda handler using Mangum
 # This wraps the FastAPI app to make it compatible with AWS Lambda
-# lifespan="auto" allows the startup event to run and initialize the database
+# lifespan="auto" allows the startup event to run and initialize the database.
+# Mangum runs the lifespan around every invocation, so the audit writer is
+# started and fully flushed once per invocation, before Lambda freezes.
 handler = Mangum(app, lifespan="auto")
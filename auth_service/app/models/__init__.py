@@ -1,4 +1,5 @@
 """Models module exports"""
 from .test_item import TestItem
+from .audit_event import AuditEvent
 
-__all__ = ["TestItem"]
+__all__ = ["TestItem", "AuditEvent"]
@@ -0,0 +1,27 @@
+"""
+AuditEvent model for login, token refresh and mutation audit records.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class AuditEvent(Base):
+    """
+    Append-only audit record.
+
+    Rows are written in multi-row batches by the audit writer
+    (see app.services.audit), never inside a request transaction.
+    """
+    __tablename__ = "audit_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(64), nullable=False, index=True)
+    actor = Column(String(255), nullable=True, index=True)
+    resource = Column(String(255), nullable=True)
+    payload = Column(JSON(none_as_null=True), nullable=True)  # None -> SQL NULL, not JSON null
+    # Set when the event is emitted, not when the batch is flushed
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<AuditEvent(id={self.id}, event_type='{self.event_type}')>"
@@ -0,0 +1,4 @@
+"""Services module exports"""
+from .audit import audit_writer, AuditWriter, AuditEventType
+
+__all__ = ["audit_writer", "AuditWriter", "AuditEventType"]
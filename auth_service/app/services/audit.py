@@ -0,0 +1,372 @@
+"""
+Batched asynchronous audit event writer.
+
+Request handlers call ``audit_writer.emit(...)``, which only enqueues the
+event in a bounded in-process queue. A background task started in the
+application lifespan drains the queue and writes events to Postgres as
+multi-row INSERTs, flushing whenever AUDIT_BATCH_SIZE events are ready or
+AUDIT_FLUSH_INTERVAL_SECONDS has elapsed, whichever comes first.
+"""
+import asyncio
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings, AuditOverflowPolicy
+from app.db.database import engine
+from app.models.audit_event import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+# Put on the queue by stop() to wake a flusher blocked waiting for events
+_STOP = object()
+
+
+class AuditEventType(str, Enum):
+    """Known audit event types"""
+    LOGIN = "auth.login"
+    TOKEN_REFRESH = "auth.token_refresh"
+    ITEM_CREATED = "item.created"
+    ITEM_DELETED = "item.deleted"
+
+
+class AuditWriter:
+    """
+    Bounded queue plus background flusher for audit events.
+
+    ``emit`` is thread-safe and never touches the database, so it can be
+    called from sync endpoints running in the threadpool. What happens when
+    the queue is full is governed by the overflow policy:
+
+    - DROP: the new event is discarded
+    - BLOCK: the caller waits up to ``block_timeout`` seconds, then drops
+    - SPILL: the event is appended to a local JSON-lines file, which is
+      replayed into the database on the next flush
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: AuditOverflowPolicy = AuditOverflowPolicy.DROP,
+        block_timeout: float = 0.5,
+        spill_path: Optional[str] = None,
+    ):
+        if overflow_policy == AuditOverflowPolicy.SPILL and not spill_path:
+            raise ValueError("spill_path is required for the 'spill' overflow policy")
+
+        self.bind = bind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = AuditOverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        # Serialise database writes between the background task and
+        # explicit flush() calls, spill file appends, and spill replays
+        self._write_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._task = None
+        self.dropped = 0
+
+    def emit(
+        self,
+        event_type: str,
+        actor: Optional[str] = None,
+        resource: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Enqueue an audit event.
+
+        Returns True if the event was queued or spilled to disk,
+        False if it was dropped.
+        """
+        event = {
+            "event_type": event_type.value if isinstance(event_type, Enum) else event_type,
+            "actor": actor,
+            "resource": resource,
+            "payload": payload,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+        try:
+            if self.overflow_policy == AuditOverflowPolicy.BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == AuditOverflowPolicy.SPILL:
+            try:
+                self._spill([event])
+                return True
+            except (OSError, TypeError, ValueError):
+                # Never fail the request over an audit event
+                logger.exception("Failed to spill audit event to %s", self.spill_path)
+
+        self.dropped += 1
+        return False
+
+    async def start(self):
+        """Start the background flush task. Call from the app lifespan."""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background task and flush everything still pending.
+
+        Under Mangum the lifespan shuts down at the end of every invocation,
+        so this also acts as the per-invocation final flush.
+        """
+        self._stopping.set()
+        if self._task is not None:
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                pass  # A full queue never blocks the flusher anyway
+            await self._task
+            self._task = None
+        await run_in_threadpool(self.flush)
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await run_in_threadpool(self._flush_next_batch)
+            except Exception:
+                logger.exception("Audit flush failed")
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """
+        Collect up to batch_size events, waiting at most flush_interval
+        from the first event for the batch to fill.
+        """
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        if first is _STOP:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if event is _STOP:
+                break
+            batch.append(event)
+        return batch
+
+    def _drain_batch(self) -> List[Dict[str, Any]]:
+        """Collect up to batch_size events without waiting."""
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not _STOP:
+                batch.append(event)
+        return batch
+
+    def _flush_next_batch(self):
+        batch = self._next_batch()
+        if batch:
+            self._write(batch)
+        self._replay_spill()
+
+    def flush(self) -> int:
+        """
+        Synchronously write every queued and spilled event.
+
+        Safe to call from any thread. Returns the number of events written.
+        """
+        written = self._replay_spill()
+        while True:
+            batch = self._drain_batch()
+            if not batch:
+                break
+            written += self._write(batch)
+        return written
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch as a single multi-row INSERT.
+
+        If the database is unavailable the batch is spilled to disk when the
+        spill policy is active, otherwise it is dropped and logged.
+        """
+        try:
+            with self._write_lock, self.bind.begin() as conn:
+                conn.execute(insert(AuditEvent.__table__).values(batch))
+            return len(batch)
+        except Exception:
+            if self.overflow_policy == AuditOverflowPolicy.SPILL:
+                logger.exception("Audit batch insert failed, spilling %d events", len(batch))
+                try:
+                    self._spill(batch)
+                    return 0
+                except (OSError, TypeError, ValueError):
+                    logger.exception("Failed to spill audit batch to %s", self.spill_path)
+                    self.dropped += len(batch)
+            else:
+                logger.exception("Audit batch insert failed, dropping %d events", len(batch))
+                self.dropped += len(batch)
+            return 0
+
+    def _spill(self, events: List[Dict[str, Any]]):
+        lines = [
+            # default=str keeps UUID/Decimal/datetime payload values serialisable
+            json.dumps({**event, "created_at": event["created_at"].isoformat()}, default=str)
+            for event in events
+        ]
+        with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _replay_spill(self) -> int:
+        """Move spilled events back into the database."""
+        if not self.spill_path:
+            return 0
+        # Only one thread per process replays at a time
+        if not self._replay_lock.acquire(blocking=False):
+            return 0
+        try:
+            written = 0
+            for replay_path in self._claim_replay_files():
+                written += self._replay_file(replay_path)
+            return written
+        finally:
+            self._replay_lock.release()
+
+    def _new_replay_path(self) -> str:
+        # pid identifies the owner; the nonce keeps successive claims by
+        # the same process from overwriting each other
+        return f"{self.spill_path}.{os.getpid()}.{time.time_ns()}.replay"
+
+    def _claim_replay_files(self) -> List[str]:
+        """
+        Claim spill files for replay by renaming them to this process.
+
+        Renames are atomic, so with several server workers sharing the spill
+        path each file is claimed by exactly one of them. Replay files left
+        behind by an aborted replay in this process, or by a worker that has
+        since exited (e.g. recycled), are claimed too.
+        """
+        claimed = []
+        pid = os.getpid()
+
+        for path in glob.glob(f"{glob.escape(self.spill_path)}.*.replay"):
+            owner = _replay_owner(path)
+            if owner == pid:
+                claimed.append(path)
+            elif owner is not None and not _pid_alive(owner):
+                replay_path = self._new_replay_path()
+                try:
+                    os.replace(path, replay_path)
+                except FileNotFoundError:
+                    continue  # Claimed by another worker first
+                claimed.append(replay_path)
+
+        # Rename the live spill file so new spills go to a fresh file
+        replay_path = self._new_replay_path()
+        with self._spill_lock:
+            try:
+                os.replace(self.spill_path, replay_path)
+                claimed.append(replay_path)
+            except FileNotFoundError:
+                pass
+
+        return claimed
+
+    def _replay_file(self, replay_path: str) -> int:
+        """
+        Insert the events from a claimed replay file, then delete it.
+
+        Lines that cannot be parsed (e.g. torn by a crash mid-write) are
+        moved to ``<spill_path>.rejected`` instead of aborting the replay.
+        """
+        events = []
+        rejected = []
+        with open(replay_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                    event["created_at"] = datetime.fromisoformat(event["created_at"])
+                except (ValueError, TypeError, KeyError):
+                    rejected.append(line if line.endswith("\n") else line + "\n")
+                    continue
+                events.append(event)
+
+        if rejected:
+            logger.error(
+                "Quarantining %d unreadable spilled audit events to %s.rejected",
+                len(rejected), self.spill_path,
+            )
+            with open(f"{self.spill_path}.rejected", "a", encoding="utf-8") as f:
+                f.writelines(rejected)
+
+        # Batches that fail here are spilled again by _write
+        written = 0
+        for start in range(0, len(events), self.batch_size):
+            written += self._write(events[start:start + self.batch_size])
+        os.remove(replay_path)
+        return written
+
+
+def _replay_owner(path: str) -> Optional[int]:
+    """Returns the pid encoded in a replay file name, if any."""
+    try:
+        return int(os.path.basename(path).rsplit(".", 3)[-3])
+    except (IndexError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+# Global audit writer - started/stopped by the application lifespan
+audit_writer = AuditWriter(
+    engine,
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    overflow_policy=settings.AUDIT_OVERFLOW_POLICY,
+    block_timeout=settings.AUDIT_BLOCK_TIMEOUT_SECONDS,
+    spill_path=settings.AUDIT_SPILL_PATH,
+)
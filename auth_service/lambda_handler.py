@@ -3,6 +3,7 @@ Lambda handler entry point for AWS Lambda deployment.
 This file serves as the entry point specified in Lambda configuration.
 """
 from app.main import handler
+from app.services.audit import audit_writer
 
 # AWS Lambda will call this function
 # Format: lambda_handler.handler (filename.function_name)
@@ -17,4 +18,10 @@ def lambda_handler(event, context):
     Returns:
         Response formatted for API Gateway or direct invocation
     """
-    return handler(event, context)
+    try:
+        return handler(event, context)
+    finally:
+        # Final flush before Lambda freezes the container. The lifespan
+        # shutdown normally drains the writer already; this catches anything
+        # emitted if the lifespan is disabled or failed.
+        audit_writer.flush()
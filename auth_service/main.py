@@ -1,5 +1,12 @@
 from app.main import app
+from app.core.config import settings
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    if settings.DEBUG:
+        # Development: single process with auto-reload
+        import uvicorn
+        uvicorn.run("main:app", host=settings.SERVER_HOST, port=settings.SERVER_PORT, reload=True)
+    else:
+        # Production: preforked gunicorn with uvicorn workers
+        from app.core.server import run
+        run("main:app")
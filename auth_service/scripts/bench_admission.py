@@ -0,0 +1,166 @@
+"""
+Slow-database harness for the admission control middleware.
+
+Runs the real app in-process against a throwaway SQLite database whose
+every statement is delayed by --query-delay seconds. --concurrency clients
+send GET /api/v1/test/items in a closed loop for --duration seconds, with
+admission control off and then on. A shed client pauses for --retry-delay
+and tries again.
+
+Latency percentiles and goodput (served requests per second) are computed
+over 200 responses only, so fast 503s cannot make the "on" run look good.
+The run time includes waiting for requests still in flight at the deadline.
+With the layer off, requests queue behind the connection pool and the
+threadpool until they hit the pool timeout. With it on, excess requests are
+shed, and the requests that are served keep a bounded p99.
+
+Usage (from auth_service/):
+
+    python scripts/bench_admission.py
+    python scripts/bench_admission.py --concurrency 300 --duration 60 --mode on
+
+Each mode runs in its own subprocess, because the middleware is installed
+from settings when app.main is imported. The "off" run can take a couple of
+minutes: by design it shows requests waiting for the 30s pool timeout.
+
+Example run (defaults, single-CPU sandbox):
+
+    admission served goodput/s   p50 s   p99 s   max s  run s health  outcomes
+          off     45       0.5   90.17   90.37   90.37   90.4    200  {'TimeoutError': 105, '200': 45}
+           on   1276      63.6    0.17    0.39    0.42   20.0    200  {'503': 49108, '200': 1276}
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_mode(args) -> dict:
+    """Run one mode in this process and return its results."""
+    sys.path.insert(0, SERVICE_DIR)
+    import logging
+
+    import httpx
+    from sqlalchemy import event
+
+    logging.disable(logging.CRITICAL)
+
+    from app.main import app
+    from app.db.database import engine, init_db
+
+    init_db()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_database(*_):
+        time.sleep(args.query_delay)
+
+    served = []  # Latencies of 200 responses only
+    codes = {}
+    deadline = time.monotonic() + args.duration
+
+    async def client_loop(client):
+        # Closed loop: each client sends its next request once the last one
+        # finishes, pausing briefly after being shed
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get("/api/v1/test/items")
+                outcome = str(response.status_code)
+            except Exception as e:  # Pool timeouts surface as exceptions in-process
+                outcome = type(e).__name__
+            codes[outcome] = codes.get(outcome, 0) + 1
+            if outcome == "200":
+                served.append(time.perf_counter() - started)
+            elif outcome == "503":
+                await asyncio.sleep(args.retry_delay)
+
+    async def drive():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+            health = await client.get("/health")
+        return elapsed, health.status_code
+
+    elapsed, health_status = asyncio.run(drive())
+    served.sort()
+    return {
+        "codes": codes,
+        "served": len(served),
+        # Includes waiting for requests still in flight at the deadline
+        "elapsed": elapsed,
+        "goodput": len(served) / elapsed,
+        "p50": percentile(served, 0.50),
+        "p99": percentile(served, 0.99),
+        "max": served[-1] if served else float("nan"),
+        "health": health_status,
+    }
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["off", "on", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=150, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds clients keep sending")
+    parser.add_argument("--retry-delay", type=float, default=0.05, help="Client pause after a 503")
+    parser.add_argument("--query-delay", type=float, default=0.1, help="Seconds added to every statement")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_mode(args)))
+        return
+
+    modes = ["off", "on"] if args.mode == "both" else [args.mode]
+    print(f"clients: {args.concurrency}, duration: {args.duration}s, query delay: {args.query_delay}s")
+    print("latencies and goodput are for served (200) requests only")
+    print(f"{'admission':>9} {'served':>6} {'goodput/s':>9} {'p50 s':>7} {'p99 s':>7} {'max s':>7} "
+          f"{'run s':>6} {'health':>6}  outcomes")
+
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+                "ADMISSION_CONTROL_ENABLED": "true" if mode == "on" else "false",
+                "DEBUG": "false",
+                "AUDIT_SPILL_PATH": f"{tmp}/audit_spill.jsonl",
+            }
+            env.setdefault("SECRET_KEY", "bench")
+            env.setdefault("GOOGLE_CLIENT_ID", "bench")
+            env.setdefault("GOOGLE_CLIENT_SECRET", "bench")
+            child_args = [
+                "--child",
+                "--concurrency", str(args.concurrency),
+                "--duration", str(args.duration),
+                "--retry-delay", str(args.retry_delay),
+                "--query-delay", str(args.query_delay),
+            ]
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), *child_args],
+                cwd=SERVICE_DIR, env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+
+        print(
+            f"{mode:>9} {result['served']:>6} {result['goodput']:>9.1f} {result['p50']:>7.2f} "
+            f"{result['p99']:>7.2f} {result['max']:>7.2f} {result['elapsed']:>6.1f} "
+            f"{result['health']:>6}  {result['codes']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Throughput comparison of the production launcher with 1 vs N workers.
+
+Starts ``python main.py`` (DEBUG=false, so gunicorn + uvicorn workers) once
+per worker count, drives it with a fixed number of concurrent keep-alive
+clients for a fixed duration, and prints requests/s and latency
+percentiles. N defaults to the available CPUs, as in the launcher.
+
+Usage (from auth_service/, with the usual environment variables set):
+
+    python scripts/bench_workers.py
+    python scripts/bench_workers.py --workers 1 2 4 --concurrency 128 --path /
+
+The load generator runs on the same host as the server and competes with
+it for CPU; for meaningful numbers run it on a machine with spare cores,
+or point --url at a server started elsewhere and pass --no-spawn.
+
+Note: the sandbox this script was written in has a single CPU, so it
+cannot show multi-worker scaling. There, with SQLite, /health, 32 clients
+and 5s runs, it measured:
+
+    workers      req/s   p50 ms   p99 ms  errors
+          1      251.7     94.7    505.3       0
+          2      210.4    107.8    678.5       0
+
+Extra workers only add contention on one core. These are not production
+numbers; run the script on a multi-core host against Postgres to get the
+real 1 vs N comparison.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from app.core.server import available_cpus  # noqa: E402
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DEBUG": "false",
+        "SERVER_WORKERS": str(workers),
+        "SERVER_PORT": str(port),
+    }
+    return subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=SERVICE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready in {timeout}s")
+
+
+async def drive_load(url: str, path: str, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+
+        async def client_loop():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, errors, elapsed
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to compare (default: 1 and available CPUs)")
+    parser.add_argument("--path", default="/health", help="Endpoint to request")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Warm-up seconds per run")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--url", default=None, help="Benchmark an already running server")
+    parser.add_argument("--no-spawn", action="store_true", help="Don't start servers (requires --url)")
+    args = parser.parse_args()
+
+    worker_counts = args.workers or sorted({1, available_cpus()})
+    print(f"available CPUs: {available_cpus()}, path: {args.path}, "
+          f"concurrency: {args.concurrency}, duration: {args.duration}s")
+    print(f"{'workers':>7} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+
+    for workers in worker_counts:
+        url = args.url or f"http://127.0.0.1:{args.port}"
+        server = None if args.no_spawn else start_server(workers, args.port)
+        try:
+            wait_until_ready(url)
+            asyncio.run(drive_load(url, args.path, args.concurrency, args.warmup))
+            latencies, errors, elapsed = asyncio.run(
+                drive_load(url, args.path, args.concurrency, args.duration)
+            )
+        finally:
+            if server is not None:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+
+        latencies.sort()
+        print(
+            f"{workers:>7} {len(latencies) / elapsed:>10.1f} "
+            f"{percentile(latencies, 0.50) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
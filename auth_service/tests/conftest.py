@@ -0,0 +1,20 @@
+"""
+Shared pytest setup.
+
+Puts the service root on sys.path and provides the settings that have no
+defaults, so app modules import without a .env file. The database is a
+throwaway SQLite file.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+# A file database: in-memory SQLite gives each pooled connection its own
+# empty database and cannot be shared with the threadpool
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("DEBUG", "false")
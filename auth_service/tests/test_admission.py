@@ -0,0 +1,170 @@
+"""
+Tests for the adaptive admission control middleware.
+"""
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.admission import AIMDLimiter, AdmissionControlMiddleware
+
+
+def make_limiter(**overrides) -> AIMDLimiter:
+    options = {
+        "initial_limit": 10,
+        "min_limit": 2,
+        "max_limit": 20,
+        "latency_target": 0.5,
+        "pool_wait_target": 0.05,
+        "backoff_ratio": 0.5,
+    }
+    options.update(overrides)
+    return AIMDLimiter(**options)
+
+
+def fill(limiter: AIMDLimiter, count: int):
+    for _ in range(count):
+        assert limiter.try_acquire()
+
+
+class TestAIMDLimiter:
+    def test_rejects_over_limit(self):
+        limiter = make_limiter(initial_limit=3)
+        fill(limiter, 3)
+        assert not limiter.try_acquire()
+        assert limiter.in_flight == 3
+
+    def test_grows_additively_when_fast_and_utilised(self):
+        limiter = make_limiter()
+        fill(limiter, 10)
+        limiter.release(latency=0.01, pool_wait=0.0)
+        assert limiter.limit == 11
+        assert limiter.in_flight == 9
+
+    def test_does_not_grow_when_underutilised(self):
+        limiter = make_limiter()
+        fill(limiter, 1)
+        limiter.release(latency=0.01, pool_wait=0.0)
+        assert limiter.limit == 10
+
+    def test_growth_capped_at_max_limit(self):
+        limiter = make_limiter(initial_limit=20)
+        fill(limiter, 20)
+        limiter.release(latency=0.01, pool_wait=0.0)
+        assert limiter.limit == 20
+
+    def test_backs_off_on_slow_latency(self):
+        limiter = make_limiter()
+        fill(limiter, 1)
+        limiter.release(latency=1.0, pool_wait=0.0)
+        assert limiter.limit == 5
+
+    def test_backs_off_on_pool_wait(self):
+        limiter = make_limiter()
+        fill(limiter, 1)
+        limiter.release(latency=0.01, pool_wait=0.2)
+        assert limiter.limit == 5
+
+    def test_backs_off_on_failure(self):
+        limiter = make_limiter()
+        fill(limiter, 1)
+        limiter.release(latency=0.01, pool_wait=0.0, failed=True)
+        assert limiter.limit == 5
+
+    def test_backoff_floored_at_min_limit(self):
+        limiter = make_limiter()
+        for _ in range(10):
+            fill(limiter, 1)
+            limiter.release(latency=1.0, pool_wait=0.0)
+        assert limiter.limit == 2
+
+    def test_recovers_after_overload(self):
+        limiter = make_limiter()
+        for _ in range(10):
+            fill(limiter, 1)
+            limiter.release(latency=1.0, pool_wait=0.0)
+        for _ in range(5):
+            fill(limiter, int(limiter.limit))
+            for _ in range(int(limiter.limit)):
+                limiter.release(latency=0.01, pool_wait=0.0)
+        assert limiter.limit > 2
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+def make_client(**options):
+    app = Starlette(routes=[
+        Route("/health", ok),
+        Route("/items", ok, methods=["GET", "POST"]),
+    ])
+    middleware = AdmissionControlMiddleware(
+        app, exempt_paths=["/health"], retry_after=3, initial_limit=1, min_limit=1, **options
+    )
+    return TestClient(middleware), middleware
+
+
+class TestAdmissionControlMiddleware:
+    def test_admits_under_limit(self):
+        client, middleware = make_client()
+        assert client.get("/items").status_code == 200
+        assert middleware.limiters["read"].in_flight == 0
+
+    def test_sheds_over_limit_with_retry_after(self):
+        client, middleware = make_client()
+        middleware.get_limiter("read").in_flight = 1  # Saturate the read class
+
+        response = client.get("/items")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert middleware.limiters["read"].in_flight == 1
+
+    def test_route_classes_are_limited_separately(self):
+        client, middleware = make_client()
+        middleware.get_limiter("read").in_flight = 1
+
+        assert client.get("/items").status_code == 503
+        assert client.post("/items").status_code == 200
+
+    def test_exempt_paths_are_never_shed(self):
+        client, middleware = make_client()
+        middleware.get_limiter("read").in_flight = 1
+
+        assert client.get("/health").status_code == 200
+        assert middleware.limiters["read"].in_flight == 1
+
+
+
+def find_admission_middleware(app) -> AdmissionControlMiddleware:
+    layer = app.middleware_stack
+    while not isinstance(layer, AdmissionControlMiddleware):
+        layer = layer.app
+    return layer
+
+
+class TestMainAppWiring:
+    def test_initial_limit_matches_pool_capacity(self):
+        from app.db.database import engine
+        from app.main import app
+
+        client = TestClient(app)
+        client.get("/")  # Builds the middleware stack
+        middleware = find_admission_middleware(app)
+
+        assert middleware.get_limiter("read").limit == engine.pool.capacity() == 15
+
+    def test_health_and_root_exempt_when_saturated(self):
+        from app.main import app
+
+        client = TestClient(app)
+        client.get("/")
+        limiter = find_admission_middleware(app).get_limiter("read")
+        limiter.in_flight = int(limiter.limit)  # Saturate the read class
+        try:
+            assert client.get("/api/v1/test/items").status_code == 503
+            assert client.get("/health").status_code == 200
+            assert client.get("/").status_code == 200
+        finally:
+            limiter.in_flight = 0
@@ -0,0 +1,241 @@
+"""
+Tests for the batched asynchronous audit event writer.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select, func
+
+from app.core.config import AuditOverflowPolicy
+from app.models.audit_event import AuditEvent
+from app.services.audit import AuditWriter, AuditEventType
+
+VALID_LINE = json.dumps({
+    "event_type": "auth.login",
+    "actor": "user-1",
+    "resource": None,
+    "payload": None,
+    "created_at": "2026-01-01T00:00:00+00:00",
+})
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database: every pooled connection must see the same tables
+    engine = create_engine(f"sqlite:///{tmp_path}/audit.db")
+    AuditEvent.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return str(tmp_path / "audit_spill.jsonl")
+
+
+def count_events(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(AuditEvent.__table__)).scalar()
+
+
+def fetch_events(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(AuditEvent.event_type, AuditEvent.actor, AuditEvent.payload)
+            .order_by(AuditEvent.actor)
+        ).all()
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+class TestOverflowPolicies:
+    def test_drop_rejects_when_full(self, engine):
+        writer = AuditWriter(engine, max_queue_size=1, overflow_policy=AuditOverflowPolicy.DROP)
+
+        assert writer.emit(AuditEventType.LOGIN, actor="a") is True
+        assert writer.emit(AuditEventType.LOGIN, actor="b") is False
+        assert writer.dropped == 1
+
+        assert writer.flush() == 1
+        assert count_events(engine) == 1
+
+    def test_block_times_out_after_block_timeout(self, engine):
+        writer = AuditWriter(
+            engine, max_queue_size=1, overflow_policy=AuditOverflowPolicy.BLOCK, block_timeout=0.2
+        )
+        writer.emit(AuditEventType.LOGIN)
+
+        started = time.monotonic()
+        assert writer.emit(AuditEventType.LOGIN) is False
+        elapsed = time.monotonic() - started
+
+        assert 0.2 <= elapsed < 1.0
+        assert writer.dropped == 1
+
+    def test_spill_requires_a_path(self, engine):
+        with pytest.raises(ValueError):
+            AuditWriter(engine, overflow_policy=AuditOverflowPolicy.SPILL)
+
+    def test_spill_writes_json_lines_and_flush_replays_them(self, engine, spill_path):
+        writer = AuditWriter(
+            engine, max_queue_size=1, overflow_policy=AuditOverflowPolicy.SPILL, spill_path=spill_path
+        )
+        event_id = uuid.uuid4()
+
+        assert writer.emit(AuditEventType.LOGIN, actor="a")
+        assert writer.emit(AuditEventType.LOGIN, actor="b", payload={"id": event_id})
+        assert writer.emit(AuditEventType.LOGIN, actor="c", payload={"amount": Decimal("1.50")})
+
+        with open(spill_path) as f:
+            spilled = [json.loads(line) for line in f]
+        assert [event["actor"] for event in spilled] == ["b", "c"]
+
+        assert writer.flush() == 3
+        assert writer.dropped == 0
+        assert not os.path.exists(spill_path)
+        assert fetch_events(engine) == [
+            ("auth.login", "a", None),
+            ("auth.login", "b", {"id": str(event_id)}),
+            ("auth.login", "c", {"amount": "1.50"}),
+        ]
+
+    def test_failed_insert_is_dropped_under_drop_policy(self, tmp_path):
+        missing_table = create_engine(f"sqlite:///{tmp_path}/empty.db")
+        writer = AuditWriter(missing_table, overflow_policy=AuditOverflowPolicy.DROP)
+        writer.emit(AuditEventType.LOGIN, actor="a")
+
+        assert writer.flush() == 0
+        assert writer.dropped == 1
+
+    def test_failed_insert_is_spilled_under_spill_policy(self, tmp_path, spill_path):
+        missing_table = create_engine(f"sqlite:///{tmp_path}/empty.db")
+        writer = AuditWriter(
+            missing_table, overflow_policy=AuditOverflowPolicy.SPILL, spill_path=spill_path
+        )
+        writer.emit(AuditEventType.LOGIN, actor="a")
+
+        assert writer.flush() == 0
+        assert writer.dropped == 0
+        with open(spill_path) as f:
+            assert json.loads(f.read())["actor"] == "a"
+
+
+class TestReplay:
+    def make_writer(self, engine, spill_path):
+        return AuditWriter(engine, overflow_policy=AuditOverflowPolicy.SPILL, spill_path=spill_path)
+
+    def test_torn_lines_are_quarantined(self, engine, spill_path):
+        with open(spill_path, "w") as f:
+            f.write(VALID_LINE + "\n" + '{"event_type": "auth.lo')
+
+        assert self.make_writer(engine, spill_path).flush() == 1
+        assert count_events(engine) == 1
+        with open(f"{spill_path}.rejected") as f:
+            assert f.read() == '{"event_type": "auth.lo\n'
+        assert not [name for name in os.listdir(os.path.dirname(spill_path)) if name.endswith(".replay")]
+
+    def test_replay_file_of_dead_worker_is_claimed(self, engine, spill_path):
+        orphan = f"{spill_path}.{dead_pid()}.123.replay"
+        with open(orphan, "w") as f:
+            f.write(VALID_LINE + "\n")
+
+        assert self.make_writer(engine, spill_path).flush() == 1
+        assert not os.path.exists(orphan)
+
+    def test_leftover_replay_file_of_this_process_is_claimed(self, engine, spill_path):
+        leftover = f"{spill_path}.{os.getpid()}.123.replay"
+        with open(leftover, "w") as f:
+            f.write(VALID_LINE + "\n")
+
+        assert self.make_writer(engine, spill_path).flush() == 1
+        assert not os.path.exists(leftover)
+
+    def test_replay_file_of_live_worker_is_left_alone(self, engine, spill_path):
+        in_progress = f"{spill_path}.{os.getppid()}.123.replay"
+        with open(in_progress, "w") as f:
+            f.write(VALID_LINE + "\n")
+
+        assert self.make_writer(engine, spill_path).flush() == 0
+        assert os.path.exists(in_progress)
+
+
+class TestBackgroundFlush:
+    def test_flushes_full_batch_before_interval(self, engine):
+        writer = AuditWriter(engine, batch_size=2, flush_interval=5.0)
+
+        async def scenario():
+            await writer.start()
+            writer.emit(AuditEventType.LOGIN, actor="a")
+            writer.emit(AuditEventType.LOGIN, actor="b")
+            for _ in range(40):
+                if count_events(engine) == 2:
+                    break
+                await asyncio.sleep(0.05)
+            written = count_events(engine)
+            await writer.stop()
+            return written
+
+        assert asyncio.run(scenario()) == 2
+
+    def test_flushes_partial_batch_after_interval(self, engine):
+        writer = AuditWriter(engine, batch_size=100, flush_interval=0.2)
+
+        async def scenario():
+            await writer.start()
+            writer.emit(AuditEventType.LOGIN, actor="a")
+            await asyncio.sleep(1.0)
+            written = count_events(engine)
+            await writer.stop()
+            return written
+
+        assert asyncio.run(scenario()) == 1
+
+    def test_stop_is_prompt_and_writes_pending_events(self, engine):
+        writer = AuditWriter(engine, batch_size=100, flush_interval=5.0)
+
+        async def scenario():
+            await writer.start()
+            await asyncio.sleep(0.1)  # Let the flusher block waiting for events
+            for actor in ("a", "b", "c"):
+                writer.emit(AuditEventType.LOGIN, actor=actor)
+            started = time.monotonic()
+            await writer.stop()
+            return time.monotonic() - started
+
+        assert asyncio.run(scenario()) < 1.0
+        assert count_events(engine) == 3
+
+    def test_stop_on_idle_writer_is_prompt(self, engine):
+        writer = AuditWriter(engine, flush_interval=5.0)
+
+        async def scenario():
+            await writer.start()
+            await asyncio.sleep(0.1)
+            started = time.monotonic()
+            await writer.stop()
+            return time.monotonic() - started
+
+        assert asyncio.run(scenario()) < 1.0
+
+
+def test_missing_payload_is_stored_as_sql_null(engine):
+    writer = AuditWriter(engine)
+    writer.emit(AuditEventType.ITEM_DELETED, resource="test_item:1")
+    writer.flush()
+
+    with engine.connect() as conn:
+        nulls = conn.execute(
+            select(func.count()).select_from(AuditEvent.__table__).where(AuditEvent.payload.is_(None))
+        ).scalar()
+    assert nulls == 1
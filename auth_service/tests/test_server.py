@@ -0,0 +1,13 @@
+"""
+Tests for the production server launcher helpers.
+"""
+from app.core.server import LIFESPAN_SHUTDOWN_MARGIN, drain_timeout
+
+
+def test_drain_leaves_margin_for_lifespan_shutdown():
+    assert drain_timeout(30) == 30 - LIFESPAN_SHUTDOWN_MARGIN
+
+
+def test_drain_timeout_never_below_one_second():
+    assert drain_timeout(LIFESPAN_SHUTDOWN_MARGIN) == 1
+    assert drain_timeout(0) == 1